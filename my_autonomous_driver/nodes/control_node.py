@@ -8,16 +8,20 @@ them to the CARLA agent via UDP network socket.
 
 Architecture:
 - Main thread: DORA event loop listening for control commands
-- UDP client: Sends control commands to CARLA agent
+- Sender thread: Sends the most recent control command to CARLA agent via UDP
 
 Author: DORA Autonomous Driving Team
 Date: 2025-10-31
 """
 
-import json
+import logging
 import socket
+import sys
+import threading
 import time
-from typing import Dict, Any, Optional
+from collections import deque
+from typing import Dict, Optional
+import msgspec
 import pyarrow as pa
 from dora import Node
 
@@ -34,6 +38,11 @@ CARLA_AGENT_PORT = 23456          # Port where CARLA agent listens
 SOCKET_TIMEOUT = 1.0              # seconds - timeout for socket operations
 SEND_RETRY_ATTEMPTS = 3           # number of retry attempts for failed sends
 RETRY_DELAY = 0.1                 # seconds - delay between retry attempts
+SEND_BUFFER_SIZE = 1024 * 1024    # bytes - kernel send buffer (SO_SNDBUF)
+
+# Wire format of commands sent to the CARLA agent: "json" or "msgpack"
+# (msgpack is smaller and faster; switch once the agent decodes it)
+CONTROL_WIRE_FORMAT = "json"
 
 # Control Command Validation
 MIN_STEER = -1.0                  # minimum steering value
@@ -43,71 +52,68 @@ MAX_THROTTLE = 1.0                # maximum throttle value
 MIN_BRAKE = 0.0                   # minimum brake value
 MAX_BRAKE = 1.0                   # maximum brake value
 
+# Logging Configuration
+LOG_LEVEL = logging.INFO          # DEBUG traces every command
+STATS_INTERVAL = 10.0             # seconds - log statistics every 10 seconds
+
+logger = logging.getLogger("control_node")
+
 
 # ============================================
-# Utility Functions
+# Message Schemas
 # ============================================
 
-def validate_control_command(control: Dict[str, Any]) -> bool:
-    """
-    Validate control command values are within acceptable ranges.
-    
-    Args:
-        control: Dictionary containing steer, throttle, brake values
-    
-    Returns:
-        True if valid, False otherwise
-    """
-    try:
-        steer = control.get("steer", 0.0)
-        throttle = control.get("throttle", 0.0)
-        brake = control.get("brake", 0.0)
-        
-        # Check if values are within valid ranges
-        if not (MIN_STEER <= steer <= MAX_STEER):
-            print(f"[Control] Warning: Invalid steer value {steer}, expected [{MIN_STEER}, {MAX_STEER}]")
-            return False
-        
-        if not (MIN_THROTTLE <= throttle <= MAX_THROTTLE):
-            print(f"[Control] Warning: Invalid throttle value {throttle}, expected [{MIN_THROTTLE}, {MAX_THROTTLE}]")
-            return False
-        
-        if not (MIN_BRAKE <= brake <= MAX_BRAKE):
-            print(f"[Control] Warning: Invalid brake value {brake}, expected [{MIN_BRAKE}, {MAX_BRAKE}]")
-            return False
-        
-        return True
-    
-    except Exception as e:
-        print(f"[Control] Error validating control command: {e}")
-        return False
+class ControlCmd(msgspec.Struct):
+    """Control command sent to the CARLA agent."""
+    steer: float = 0.0
+    throttle: float = 0.0
+    brake: float = 0.0
+    timestamp: float = 0.0
 
 
-def clamp_control_command(control: Dict[str, Any]) -> Dict[str, Any]:
+# Reusable encoders, one per supported wire format
+CONTROL_ENCODERS = {
+    "json": msgspec.json.Encoder(),
+    "msgpack": msgspec.msgpack.Encoder(),
+}
+
+
+# ============================================
+# Utility Functions
+# ============================================
+
+def clamp_control_command(control: ControlCmd) -> bool:
     """
-    Clamp control command values to valid ranges.
+    Clamp control command values to valid ranges in a single pass.
+    
+    The command is modified in place; it is consumed immediately after, so
+    no copy is made. Out-of-range (or NaN) values are saturated to the
+    nearest bound.
     
     Args:
-        control: Dictionary containing steer, throttle, brake values
+        control: Control command with steer, throttle, brake values
     
     Returns:
-        Dictionary with clamped values
+        True if any value was clipped, False if the command was already valid
     """
-    clamped = control.copy()
+    was_clipped = False
     
-    # Clamp steering
-    if "steer" in clamped:
-        clamped["steer"] = max(MIN_STEER, min(MAX_STEER, clamped["steer"]))
+    steer = control.steer
+    if not (MIN_STEER <= steer <= MAX_STEER):
+        control.steer = MIN_STEER if steer < MIN_STEER else MAX_STEER
+        was_clipped = True
     
-    # Clamp throttle
-    if "throttle" in clamped:
-        clamped["throttle"] = max(MIN_THROTTLE, min(MAX_THROTTLE, clamped["throttle"]))
+    throttle = control.throttle
+    if not (MIN_THROTTLE <= throttle <= MAX_THROTTLE):
+        control.throttle = MIN_THROTTLE if throttle < MIN_THROTTLE else MAX_THROTTLE
+        was_clipped = True
     
-    # Clamp brake
-    if "brake" in clamped:
-        clamped["brake"] = max(MIN_BRAKE, min(MAX_BRAKE, clamped["brake"]))
+    brake = control.brake
+    if not (MIN_BRAKE <= brake <= MAX_BRAKE):
+        control.brake = MIN_BRAKE if brake < MIN_BRAKE else MAX_BRAKE
+        was_clipped = True
     
-    return clamped
+    return was_clipped
 
 
 # ============================================
@@ -122,78 +128,136 @@ class UDPControlSender:
     control commands with retry logic and error handling.
     """
     
-    def __init__(self, host: str, port: int):
+    def __init__(self, host: str, port: int, sndbuf_size: int = SEND_BUFFER_SIZE,
+                 wire_format: str = CONTROL_WIRE_FORMAT):
         """
         Initialize UDP control sender.
         
         Args:
             host: CARLA agent IP address
             port: CARLA agent port number
+            sndbuf_size: Requested kernel send buffer size in bytes
+            wire_format: Serialization used on the wire ("json" or "msgpack")
+        
+        Raises:
+            ValueError: If wire_format is not supported
+        
+        A socket that cannot be created or connected (e.g. no route to the
+        agent yet) is logged and recreated on the next send.
         """
+        if wire_format not in CONTROL_ENCODERS:
+            raise ValueError(f"Unsupported wire format {wire_format!r}, "
+                             f"expected one of {sorted(CONTROL_ENCODERS)}")
+        
         self.host = host
         self.port = port
+        self.sndbuf_size = sndbuf_size
+        self.wire_format = wire_format
+        self._encode = CONTROL_ENCODERS[wire_format].encode
         self.socket: Optional[socket.socket] = None
         self.commands_sent = 0
         self.send_failures = 0
         
-        self._create_socket()
+        try:
+            self._create_socket()
+        except OSError as e:
+            logger.error("Error creating UDP socket: %s (retrying on next send)", e)
     
     def _create_socket(self) -> None:
-        """Create and configure UDP socket."""
+        """
+        Create, configure and connect the UDP socket.
+        
+        Connecting fixes the destination in the kernel once, so each command
+        goes out with a plain send() instead of sendto() with an address.
+        
+        Raises:
+            OSError: If the socket cannot be created or connected
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         try:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self.socket.settimeout(SOCKET_TIMEOUT)
-            print(f"[Control] UDP socket created for {self.host}:{self.port}")
-        except Exception as e:
-            print(f"[Control] Error creating UDP socket: {e}")
-            self.socket = None
+            sock.settimeout(SOCKET_TIMEOUT)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sndbuf_size)
+            actual_sndbuf = sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
+            if sys.platform.startswith("linux"):
+                actual_sndbuf //= 2  # Linux reports double the applied size
+            if actual_sndbuf < self.sndbuf_size:
+                logger.warning("SO_SNDBUF capped at %d bytes (requested %d); "
+                               "raise net.core.wmem_max to allow more",
+                               actual_sndbuf, self.sndbuf_size)
+            sock.connect((self.host, self.port))
+        except OSError:
+            sock.close()
+            raise
+        
+        self.socket = sock
+        logger.info("UDP socket created for %s:%d", self.host, self.port)
+    
+    def _reconnect(self) -> None:
+        """Replace the current socket after a send error (failures are logged)."""
+        self.close()
+        try:
+            self._create_socket()
+        except OSError as e:
+            logger.error("Error recreating UDP socket: %s", e)
     
-    def send_control_command(self, control: Dict[str, Any]) -> bool:
+    def send_control_command(self, control: ControlCmd) -> bool:
         """
         Send control command to CARLA agent via UDP.
         
         Args:
-            control: Dictionary containing steer, throttle, brake values
+            control: Control command with steer, throttle, brake values
         
         Returns:
             True if successfully sent, False otherwise
         """
-        if self.socket is None:
-            print("[Control] Socket not initialized, attempting to recreate...")
-            self._create_socket()
-            if self.socket is None:
-                return False
-        
-        # Validate and clamp control values
-        if not validate_control_command(control):
-            print("[Control] Clamping invalid control values...")
-            control = clamp_control_command(control)
+        # Clamp control values to their valid ranges
+        if clamp_control_command(control):
+            logger.warning("Clamped invalid control values to steer=%s, throttle=%s, brake=%s",
+                           control.steer, control.throttle, control.brake)
         
-        # Serialize control command to JSON
+        # Serialize control command in the configured wire format
         try:
-            control_json = json.dumps(control)
-            control_bytes = control_json.encode('utf-8')
+            control_bytes = self._encode(control)
         except Exception as e:
-            print(f"[Control] Error serializing control command: {e}")
+            logger.error("Error serializing control command: %s", e)
             return False
         
         # Send with retry logic
         for attempt in range(SEND_RETRY_ATTEMPTS):
+            if self.socket is None:
+                # Initial connect or an earlier reconnect failed; try again
+                self._reconnect()
+                if self.socket is None:
+                    # Still no socket (failure already logged); wait and retry
+                    if attempt < SEND_RETRY_ATTEMPTS - 1:
+                        time.sleep(RETRY_DELAY)
+                    continue
+            
             try:
-                bytes_sent = self.socket.sendto(control_bytes, (self.host, self.port))
+                bytes_sent = self.socket.send(control_bytes)
                 
                 if bytes_sent == len(control_bytes):
                     self.commands_sent += 1
                     return True
                 else:
-                    print(f"[Control] Partial send: {bytes_sent}/{len(control_bytes)} bytes")
+                    logger.warning("Partial send: %d/%d bytes", bytes_sent, len(control_bytes))
             
             except socket.timeout:
-                print(f"[Control] Send timeout (attempt {attempt + 1}/{SEND_RETRY_ATTEMPTS})")
+                logger.warning("Send timeout (attempt %d/%d)", attempt + 1, SEND_RETRY_ATTEMPTS)
+            except ConnectionRefusedError:
+                # A connected UDP socket reports the ICMP port-unreachable of an
+                # earlier datagram here (agent not listening yet); the socket is
+                # fine and the error is now cleared, so retry at once
+                logger.debug("CARLA agent port unreachable (attempt %d/%d)",
+                             attempt + 1, SEND_RETRY_ATTEMPTS)
+                continue
             except socket.error as e:
-                print(f"[Control] Socket error (attempt {attempt + 1}/{SEND_RETRY_ATTEMPTS}): {e}")
+                logger.warning("Socket error (attempt %d/%d): %s",
+                               attempt + 1, SEND_RETRY_ATTEMPTS, e)
+                self._reconnect()
             except Exception as e:
-                print(f"[Control] Unexpected error (attempt {attempt + 1}/{SEND_RETRY_ATTEMPTS}): {e}")
+                logger.warning("Unexpected error (attempt %d/%d): %s",
+                               attempt + 1, SEND_RETRY_ATTEMPTS, e)
             
             # Wait before retry (except on last attempt)
             if attempt < SEND_RETRY_ATTEMPTS - 1:
@@ -201,7 +265,7 @@ class UDPControlSender:
         
         # All retry attempts failed
         self.send_failures += 1
-        print(f"[Control] Failed to send command after {SEND_RETRY_ATTEMPTS} attempts")
+        logger.error("Failed to send command after %d attempts", SEND_RETRY_ATTEMPTS)
         return False
     
     def get_statistics(self) -> Dict[str, int]:
@@ -221,13 +285,93 @@ class UDPControlSender:
         if self.socket is not None:
             try:
                 self.socket.close()
-                print("[Control] UDP socket closed")
+                logger.info("UDP socket closed")
             except Exception as e:
-                print(f"[Control] Error closing socket: {e}")
+                logger.error("Error closing socket: %s", e)
             finally:
                 self.socket = None
 
 
+# ============================================
+# Latest-Value Sender Thread
+# ============================================
+
+class LatestControlSender:
+    """
+    Background thread that sends only the most recent control command.
+    
+    The DORA loop overwrites a single-slot holder and returns immediately, so
+    a slow or retrying send never blocks it. When the sender thread is ready
+    again it picks up the freshest command; commands superseded in the
+    meantime are dropped rather than sent stale.
+    """
+    
+    def __init__(self, sender: UDPControlSender):
+        """
+        Initialize the sender thread (not started).
+        
+        Args:
+            sender: UDP sender used exclusively by the background thread
+        """
+        self.sender = sender
+        self._pending: deque = deque(maxlen=1)
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self.commands_superseded = 0
+    
+    def start(self) -> None:
+        """Start the background sender thread."""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="control_sender", daemon=True)
+        self._thread.start()
+    
+    def submit(self, control: ControlCmd) -> None:
+        """
+        Hand a command to the sender thread, replacing any unsent one.
+        
+        Args:
+            control: Control command to send; not touched by the caller afterwards
+        """
+        if self._pending:
+            self.commands_superseded += 1
+        self._pending.append(control)
+        self._wakeup.set()
+    
+    def _run(self) -> None:
+        """Send pending commands until stopped, flushing the last one on exit."""
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            
+            while self._pending:
+                try:
+                    control = self._pending.popleft()
+                except IndexError:
+                    break
+                
+                if self.sender.send_control_command(control):
+                    logger.debug("✓ Command sent to CARLA successfully")
+                else:
+                    logger.debug("✗ Failed to send command to CARLA")
+            
+            if not self._running:
+                break
+    
+    def stop(self, timeout: float = SOCKET_TIMEOUT * SEND_RETRY_ATTEMPTS) -> None:
+        """
+        Stop the sender thread after it flushes the pending command.
+        
+        Args:
+            timeout: Maximum time to wait for the thread to finish in seconds
+        """
+        self._running = False
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
 # ============================================
 # Main DORA Node
 # ============================================
@@ -237,28 +381,31 @@ def main():
     Main DORA node entry point.
     
     This function:
-    1. Initializes the UDP control sender
+    1. Initializes the UDP control sender and starts the sender thread
     2. Enters the DORA event loop
     3. Listens for control commands from the planner
-    4. Sends control commands to CARLA agent via UDP
+    4. Hands the latest control command to the sender thread
     """
+    logging.basicConfig(level=LOG_LEVEL, format="[Control] %(message)s")
+    
     print("=" * 60)
     print("DORA CONTROL SENDER NODE - DORA to CARLA Bridge")
     print("=" * 60)
     
     # Initialize UDP control sender
     control_sender = UDPControlSender(CARLA_AGENT_HOST, CARLA_AGENT_PORT)
-    print(f"[Control] Sending commands to CARLA agent at {CARLA_AGENT_HOST}:{CARLA_AGENT_PORT}")
+    latest_sender = LatestControlSender(control_sender)
+    latest_sender.start()
+    logger.info("Sending commands to CARLA agent at %s:%d", CARLA_AGENT_HOST, CARLA_AGENT_PORT)
     
     # Initialize DORA node
     node = Node()
-    print("[Control] DORA node initialized")
-    print("[Control] Waiting for control commands from planner...")
+    logger.info("DORA node initialized")
+    logger.info("Waiting for control commands from planner...")
     print("=" * 60)
     
     # Statistics
     last_stats_time = time.time()
-    stats_interval = 10.0  # seconds - print statistics every 10 seconds
     
     # DORA event loop
     try:
@@ -272,57 +419,47 @@ def main():
                 # Handle control command input
                 if event_id == "control_cmd":
                     try:
-                        # Extract control command from PyArrow array
-                        value = event["value"]
-                        control_json_str = value[0].as_py()  # Get first element as Python object
-                        control_command = json.loads(control_json_str)
-                        
-                        # Extract control values
-                        steer = control_command.get("steer", 0.0)
-                        throttle = control_command.get("throttle", 0.0)
-                        brake = control_command.get("brake", 0.0)
-                        timestamp = control_command.get("timestamp", 0.0)
-                        
-                        print(f"[Control] Received command: steer={steer:.3f}, "
-                              f"throttle={throttle:.3f}, brake={brake:.3f}, "
-                              f"timestamp={timestamp:.3f}")
+                        # Convert the typed Arrow struct row into a ControlCmd;
+                        # null fields are dropped so they default to 0.0 like
+                        # missing ones (unknown fields are ignored)
+                        row = event["value"][0].as_py()
+                        control = msgspec.convert(
+                            {k: v for k, v in row.items() if v is not None}, ControlCmd)
                         
-                        # Send control command to CARLA
-                        success = control_sender.send_control_command(control_command)
+                        logger.debug("Received command: steer=%.3f, throttle=%.3f, "
+                                     "brake=%.3f, timestamp=%.3f",
+                                     control.steer, control.throttle,
+                                     control.brake, control.timestamp)
                         
-                        if success:
-                            print(f"[Control] ✓ Command sent to CARLA successfully")
-                        else:
-                            print(f"[Control] ✗ Failed to send command to CARLA")
+                        # Queue control command for CARLA (replaces any unsent one)
+                        latest_sender.submit(control)
                     
-                    except json.JSONDecodeError as e:
-                        print(f"[Control] Error: Invalid JSON in control command: {e}")
-                    except Exception as e:
-                        print(f"[Control] Error processing control command: {e}")
-                        import traceback
-                        traceback.print_exc()
+                    except msgspec.ValidationError as e:
+                        logger.error("Invalid control command: %s", e)
+                    except Exception:
+                        logger.exception("Error processing control command")
                 
                 else:
-                    print(f"[Control] Received unexpected input: {event_id}")
+                    logger.warning("Received unexpected input: %s", event_id)
             
-            # Print statistics periodically
+            # Log statistics periodically
             current_time = time.time()
-            if current_time - last_stats_time >= stats_interval:
+            if current_time - last_stats_time >= STATS_INTERVAL:
                 stats = control_sender.get_statistics()
-                print(f"[Control] Statistics - Sent: {stats['commands_sent']}, "
-                      f"Failed: {stats['send_failures']}")
+                logger.info("Statistics - Sent: %d, Failed: %d, Superseded: %d",
+                            stats['commands_sent'], stats['send_failures'],
+                            latest_sender.commands_superseded)
                 last_stats_time = current_time
     
     except KeyboardInterrupt:
-        print("\n[Control] Shutting down control sender node...")
-    except Exception as e:
-        print(f"[Control] Fatal error in DORA event loop: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.info("Shutting down control sender node...")
+    except Exception:
+        logger.exception("Fatal error in DORA event loop")
     finally:
         # Cleanup
+        latest_sender.stop()
         control_sender.close()
-        print("[Control] Node shutdown complete")
+        logger.info("Node shutdown complete")
 
 
 # ============================================
@@ -15,12 +15,15 @@ Author: DORA Autonomous Driving Team
 Date: 2025-10-31
 """
 
-import json
+import logging
+import selectors
 import socket
 import struct
+import sys
 import threading
 import time
-from typing import Dict, Any, Optional
+from typing import NamedTuple, Optional, Tuple, Union
+import msgspec
 import pyarrow as pa
 from dora import Node
 
@@ -35,7 +38,94 @@ TCP_HOST = "0.0.0.0"  # Listen on all network interfaces
 TCP_PORT = 5005       # Port for LiDAR data (binary)
 
 BUFFER_SIZE = 65536   # 64KB buffer for UDP packets
-LIDAR_BUFFER_SIZE = 1024 * 1024  # 1MB buffer for LiDAR data
+UDP_RCVBUF_SIZE = 4 * 1024 * 1024  # 4MB kernel receive buffer (absorbs bursts)
+LIDAR_BUFFER_SIZE = 1024 * 1024  # 1MB kernel receive buffer for LiDAR connections
+MAX_LIDAR_FRAME_SIZE = 64 * 1024 * 1024  # 64MB cap on the length header of a LiDAR frame
+UDP_RECV_BATCH_SIZE = 16  # Max queued datagrams drained per wakeup
+ACCEPT_ERROR_BACKOFF = 1.0  # Seconds the listener is paused after an accept error
+
+# Max time the main loop blocks waiting for sensor data before checking for
+# queued DORA events (bounds how late a tick or STOP is noticed)
+SENSOR_WAIT_TIMEOUT = 0.05  # seconds
+
+# Max DORA events handled per loop iteration; events already queued behind the
+# current one are drained without blocking before the next sensor publish
+DORA_EVENT_BATCH_SIZE = 16
+
+# DORA outputs in SensorDataBuffer.wait_any() order: (output id, log label)
+SENSOR_OUTPUTS = (
+    ("gnss_data", "GNSS"),
+    ("imu_data", "IMU"),
+    ("lidar_data", "LiDAR"),
+)
+
+# Low-latency Socket Options (Linux only)
+# Busy-poll the device queue for this many microseconds before sleeping in
+# recvfrom, trading a little CPU for lower wakeup latency on each sample.
+# Values above net.core.busy_poll need CAP_NET_ADMIN; refusal is non-fatal.
+UDP_BUSY_POLL_USEC = 50
+SO_BUSY_POLL = getattr(socket, "SO_BUSY_POLL", 46)  # not exported by Python
+
+# Logging Configuration
+LOG_LEVEL = logging.INFO  # DEBUG traces every sample
+
+logger = logging.getLogger("receiver_node")
+
+
+# ============================================
+# Message Schemas
+# ============================================
+
+class SensorHeader(msgspec.Struct):
+    """
+    Routing fields of a GNSS/IMU message sent by CARLA over UDP.
+    
+    Only these fields are decoded; the sensor-specific "data" object is
+    skipped and the original datagram is forwarded to DORA untouched.
+    """
+    type: str = "unknown"
+    timestamp: float = 0.0
+
+
+class SensorPayload(NamedTuple):
+    """
+    Raw sensor message together with its timestamp.
+    
+    GNSS/IMU carry the JSON datagram and its parsed timestamp; LiDAR carries
+    the binary point cloud and its time of receipt.
+    """
+    raw: Union[bytes, bytearray]
+    timestamp: float
+
+
+# Reusable decoder (schema is compiled once, not per packet)
+sensor_header_decoder = msgspec.json.Decoder(SensorHeader)
+
+
+# ============================================
+# PyArrow Helpers
+# ============================================
+
+BINARY_TYPE = pa.binary()
+BINARY_OFFSETS = struct.Struct("<ii")  # int32 offsets of a one-element binary array
+
+
+def to_binary_array(payload: bytes) -> pa.Array:
+    """
+    Wrap a bytes-like payload as a one-element PyArrow binary array.
+    
+    The array is assembled from buffers directly, so there is no type
+    inference over a Python list and the payload itself is not copied
+    (the caller must not mutate it afterwards).
+    
+    Args:
+        payload: bytes or bytearray to wrap
+    
+    Returns:
+        PyArrow binary array of length 1 backed by the payload's memory
+    """
+    offsets = pa.py_buffer(BINARY_OFFSETS.pack(0, len(payload)))
+    return pa.Array.from_buffers(BINARY_TYPE, 1, [None, offsets, pa.py_buffer(payload)])
 
 
 # ============================================
@@ -43,61 +133,73 @@ LIDAR_BUFFER_SIZE = 1024 * 1024  # 1MB buffer for LiDAR data
 # ============================================
 
 class SensorDataBuffer:
-    """Thread-safe buffer for storing incoming sensor data."""
+    """
+    Thread-safe latest-value buffer for storing incoming sensor data.
+    
+    Every sensor slot has exactly one producer thread (UDP or TCP server)
+    and one consumer (the main loop). A producer publishes by replacing the
+    slot's (sequence, data) tuple in a single assignment, which is atomic
+    under the GIL; the consumer compares sequence numbers against the last
+    ones it saw. Storing and fetching therefore take no lock. An Event
+    wakes the consumer whenever any slot is updated.
+    """
     
     def __init__(self):
-        self.lock = threading.Lock()
-        self.gnss_data: Optional[Dict[str, Any]] = None
-        self.imu_data: Optional[Dict[str, Any]] = None
-        self.lidar_data: Optional[bytes] = None
-        self.gnss_updated = False
-        self.imu_updated = False
-        self.lidar_updated = False
-    
-    def set_gnss(self, data: Dict[str, Any]) -> None:
-        """Store GNSS data and mark as updated."""
-        with self.lock:
-            self.gnss_data = data
-            self.gnss_updated = True
-    
-    def set_imu(self, data: Dict[str, Any]) -> None:
-        """Store IMU data and mark as updated."""
-        with self.lock:
-            self.imu_data = data
-            self.imu_updated = True
-    
-    def set_lidar(self, data: bytes) -> None:
-        """Store LiDAR data and mark as updated."""
-        with self.lock:
-            self.lidar_data = data
-            self.lidar_updated = True
-    
-    def get_and_clear_gnss(self) -> Optional[Dict[str, Any]]:
-        """Retrieve GNSS data if updated, then clear the flag."""
-        with self.lock:
-            if self.gnss_updated:
-                data = self.gnss_data
-                self.gnss_updated = False
-                return data
-            return None
-    
-    def get_and_clear_imu(self) -> Optional[Dict[str, Any]]:
-        """Retrieve IMU data if updated, then clear the flag."""
-        with self.lock:
-            if self.imu_updated:
-                data = self.imu_data
-                self.imu_updated = False
-                return data
-            return None
-    
-    def get_and_clear_lidar(self) -> Optional[bytes]:
-        """Retrieve LiDAR data if updated, then clear the flag."""
-        with self.lock:
-            if self.lidar_updated:
-                data = self.lidar_data
-                self.lidar_updated = False
-                return data
-            return None
+        self.data_ready = threading.Event()
+        self.gnss_slot: Tuple[int, Optional[SensorPayload]] = (0, None)
+        self.imu_slot: Tuple[int, Optional[SensorPayload]] = (0, None)
+        self.lidar_slot: Tuple[int, Optional[SensorPayload]] = (0, None)
+        self.gnss_seen = 0
+        self.imu_seen = 0
+        self.lidar_seen = 0
+    
+    def set_gnss(self, data: SensorPayload) -> None:
+        """Publish GNSS data under the next sequence number."""
+        self.gnss_slot = (self.gnss_slot[0] + 1, data)
+        self.data_ready.set()
+    
+    def set_imu(self, data: SensorPayload) -> None:
+        """Publish IMU data under the next sequence number."""
+        self.imu_slot = (self.imu_slot[0] + 1, data)
+        self.data_ready.set()
+    
+    def set_lidar(self, data: SensorPayload) -> None:
+        """Publish LiDAR data under the next sequence number."""
+        self.lidar_slot = (self.lidar_slot[0] + 1, data)
+        self.data_ready.set()
+    
+    def wait_any(self, timeout: float) -> Tuple[Optional[SensorPayload],
+                                                Optional[SensorPayload],
+                                                Optional[SensorPayload]]:
+        """
+        Wait until any sensor has fresh data, then retrieve it.
+        
+        Must only be called from the single consumer thread.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+        
+        Returns:
+            Tuple of (gnss, imu, lidar); entries without fresh data are None
+        """
+        self.data_ready.wait(timeout)
+        # Clear before reading the slots: a publish racing with us re-sets
+        # the event, so it is picked up on the next call at the latest
+        self.data_ready.clear()
+        
+        gnss_seq, gnss = self.gnss_slot
+        imu_seq, imu = self.imu_slot
+        lidar_seq, lidar = self.lidar_slot
+        
+        if gnss_seq == self.gnss_seen:
+            gnss = None
+        if imu_seq == self.imu_seen:
+            imu = None
+        if lidar_seq == self.lidar_seen:
+            lidar = None
+        
+        self.gnss_seen, self.imu_seen, self.lidar_seen = gnss_seq, imu_seq, lidar_seq
+        return gnss, imu, lidar
 
 
 # Global sensor buffer instance
@@ -118,148 +220,322 @@ def udp_server_thread():
         "timestamp": float,
         "data": { ... sensor-specific fields ... }
     }
+    
+    After each blocking receive, any datagrams already queued in the kernel
+    are drained without blocking (up to UDP_RECV_BATCH_SIZE). Only the newest
+    message of each sensor type in a batch is stored; older ones would be
+    overwritten before the main loop publishes them anyway.
+    
+    Only "type" and "timestamp" are decoded for routing; the stored payload
+    is a copy of the original datagram bytes, forwarded to DORA as-is.
     """
-    print(f"[UDP Server] Starting on {UDP_HOST}:{UDP_PORT}")
+    logger.info("[UDP Server] Starting on %s:%d", UDP_HOST, UDP_PORT)
     
     # Create UDP socket
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     
+    if sys.platform.startswith("linux"):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL, UDP_BUSY_POLL_USEC)
+        except OSError as e:
+            logger.warning("[UDP Server] SO_BUSY_POLL not enabled: %s", e)
+    
     try:
         sock.bind((UDP_HOST, UDP_PORT))
-        print(f"[UDP Server] Listening for GNSS/IMU data...")
+        
+        # Enlarge the kernel receive buffer so bursts are not silently dropped
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RCVBUF_SIZE)
+        actual_rcvbuf = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        if sys.platform.startswith("linux"):
+            actual_rcvbuf //= 2  # Linux reports double the applied size
+        if actual_rcvbuf < UDP_RCVBUF_SIZE:
+            logger.warning("[UDP Server] SO_RCVBUF capped at %d bytes (requested %d); "
+                           "raise net.core.rmem_max to allow more",
+                           actual_rcvbuf, UDP_RCVBUF_SIZE)
+        
+        logger.info("[UDP Server] Listening for GNSS/IMU data...")
+        
+        # Non-blocking drain needs MSG_DONTWAIT (unavailable on Windows)
+        can_drain = hasattr(socket, "MSG_DONTWAIT")
+        
+        # Preallocated receive buffers, one per batch slot, reused for every
+        # datagram; the decoder reads straight from a memoryview slice
+        recv_views = [memoryview(bytearray(BUFFER_SIZE)) for _ in range(UDP_RECV_BATCH_SIZE)]
+        batch = []
         
         while True:
             try:
-                # Receive data from CARLA
-                data, addr = sock.recvfrom(BUFFER_SIZE)
+                # Block for the next datagram from CARLA, then drain the backlog
+                batch.clear()
+                nbytes, addr = sock.recvfrom_into(recv_views[0])
+                batch.append((recv_views[0][:nbytes], addr))
+                while can_drain and len(batch) < UDP_RECV_BATCH_SIZE:
+                    view = recv_views[len(batch)]
+                    try:
+                        nbytes, addr = sock.recvfrom_into(view, 0, socket.MSG_DONTWAIT)
+                    except BlockingIOError:
+                        break
+                    batch.append((view[:nbytes], addr))
                 
-                # Parse JSON data
-                try:
-                    message = json.loads(data.decode('utf-8'))
-                    sensor_type = message.get("type", "unknown")
-                    
-                    if sensor_type == "gnss":
-                        sensor_buffer.set_gnss(message)
-                        print(f"[UDP Server] Received GNSS data from {addr}")
+                # Walk newest-first so only the freshest sample per type is stored
+                seen_types = set()
+                for data, addr in reversed(batch):
+                    # Decode only the routing header, not the sensor payload
+                    try:
+                        header = sensor_header_decoder.decode(data)
+                        sensor_type = header.type
+                        
+                        if sensor_type in seen_types:
+                            continue
+                        seen_types.add(sensor_type)
+                        
+                        # Copy out of the reused receive buffer only what we keep
+                        if sensor_type == "gnss":
+                            sensor_buffer.set_gnss(SensorPayload(bytes(data), header.timestamp))
+                            logger.debug("[UDP Server] Received GNSS data from %s", addr)
+                        
+                        elif sensor_type == "imu":
+                            sensor_buffer.set_imu(SensorPayload(bytes(data), header.timestamp))
+                            logger.debug("[UDP Server] Received IMU data from %s", addr)
+                        
+                        else:
+                            logger.warning("[UDP Server] Unknown sensor type: %s", sensor_type)
                     
-                    elif sensor_type == "imu":
-                        sensor_buffer.set_imu(message)
-                        print(f"[UDP Server] Received IMU data from {addr}")
-                    
-                    else:
-                        print(f"[UDP Server] Unknown sensor type: {sensor_type}")
-                
-                except json.JSONDecodeError as e:
-                    print(f"[UDP Server] JSON decode error: {e}")
-                except Exception as e:
-                    print(f"[UDP Server] Error processing message: {e}")
+                    except msgspec.DecodeError as e:
+                        logger.warning("[UDP Server] JSON decode error: %s", e)
+                    except Exception as e:
+                        logger.warning("[UDP Server] Error processing message: %s", e)
             
             except socket.timeout:
                 continue
             except Exception as e:
-                print(f"[UDP Server] Socket error: {e}")
+                logger.error("[UDP Server] Socket error: %s", e)
                 time.sleep(1)  # Brief pause before retry
     
     except Exception as e:
-        print(f"[UDP Server] Fatal error: {e}")
+        logger.error("[UDP Server] Fatal error: %s", e)
     finally:
         sock.close()
-        print("[UDP Server] Shutdown")
+        logger.info("[UDP Server] Shutdown")
 
 
 # ============================================
 # TCP Server for LiDAR Data
 # ============================================
 
-def handle_lidar_client(client_socket: socket.socket, addr: tuple):
+class LidarClientState:
     """
-    Handle individual LiDAR client connection.
+    Framing state of one non-blocking LiDAR client connection.
     
     Expected binary format:
     - 4 bytes: message length (uint32, big-endian)
     - N bytes: LiDAR point cloud data
+    
+    The reader alternates between filling the 4-byte header and filling a
+    body buffer preallocated to the announced length, so large point clouds
+    are copied once instead of being concatenated.
     """
-    print(f"[TCP Server] Client connected from {addr}")
     
-    try:
-        while True:
-            # Read message length header (4 bytes)
-            length_data = client_socket.recv(4)
-            if not length_data or len(length_data) < 4:
-                print(f"[TCP Server] Client {addr} disconnected")
-                break
-            
-            # Unpack message length
-            message_length = struct.unpack('>I', length_data)[0]
-            
-            # Read the full message
-            received_data = b''
-            remaining = message_length
-            
-            while remaining > 0:
-                chunk = client_socket.recv(min(remaining, LIDAR_BUFFER_SIZE))
-                if not chunk:
-                    print(f"[TCP Server] Connection lost from {addr}")
-                    return
-                received_data += chunk
-                remaining -= len(chunk)
-            
-            # Store LiDAR data in buffer
-            sensor_buffer.set_lidar(received_data)
-            print(f"[TCP Server] Received LiDAR data ({len(received_data)} bytes) from {addr}")
+    def __init__(self, addr: tuple):
+        self.addr = addr
+        self.header = bytearray(4)
+        self.body: Optional[bytearray] = None
+        self.view = memoryview(self.header)
+        self.offset = 0
     
-    except Exception as e:
-        print(f"[TCP Server] Error handling client {addr}: {e}")
-    finally:
-        client_socket.close()
-        print(f"[TCP Server] Connection closed: {addr}")
+    def expect_header(self) -> None:
+        """Start reading the next frame's length header."""
+        self.body = None
+        self.view = memoryview(self.header)
+        self.offset = 0
+    
+    def expect_body(self, length: int) -> None:
+        """Start reading a frame body of the given length."""
+        self.body = bytearray(length)
+        self.view = memoryview(self.body)
+        self.offset = 0
+
+
+def read_lidar_client(client_socket: socket.socket, state: LidarClientState) -> bool:
+    """
+    Read everything currently available on a LiDAR client connection.
+    
+    Completed frames are stored in the sensor buffer as they finish.
+    
+    Args:
+        client_socket: Non-blocking client socket reported readable
+        state: Framing state of this connection
+    
+    Returns:
+        True to keep the connection open, False once the peer has closed it
+        or sent an oversized frame header
+    """
+    recv_into = client_socket.recv_into
+    
+    while True:
+        try:
+            received = recv_into(state.view[state.offset:])
+        except (BlockingIOError, InterruptedError):
+            return True
+        
+        if received == 0:
+            if state.body is None and state.offset == 0:
+                logger.info("[TCP Server] Client %s disconnected", state.addr)
+            else:
+                logger.warning("[TCP Server] Connection lost from %s", state.addr)
+            return False
+        
+        state.offset += received
+        if state.offset < len(state.view):
+            continue
+        
+        if state.body is None:
+            # Header complete: size the body buffer from the message length
+            message_length = int.from_bytes(state.header, "big")
+            if message_length > MAX_LIDAR_FRAME_SIZE:
+                # Corrupt or hostile header: don't allocate, drop the client
+                logger.warning("[TCP Server] LiDAR frame of %d bytes from %s exceeds %d, "
+                               "closing connection", message_length, state.addr,
+                               MAX_LIDAR_FRAME_SIZE)
+                return False
+            state.expect_body(message_length)
+            if message_length > 0:
+                continue
+        
+        # Body complete: store LiDAR data in buffer
+        sensor_buffer.set_lidar(SensorPayload(state.body, time.time()))
+        logger.debug("[TCP Server] Received LiDAR data (%d bytes) from %s",
+                     len(state.body), state.addr)
+        state.expect_header()
 
 
 def tcp_server_thread():
     """
     TCP server thread that accepts LiDAR data connections from CARLA.
-    Each client connection is handled in a separate thread.
+    
+    The listening socket and all client connections are multiplexed in a
+    single selector loop (epoll on Linux) instead of one thread per client.
     """
-    print(f"[TCP Server] Starting on {TCP_HOST}:{TCP_PORT}")
+    logger.info("[TCP Server] Starting on %s:%d", TCP_HOST, TCP_PORT)
     
     # Create TCP socket
     server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     
+    # Set before listen() so accepted connections inherit it and negotiate
+    # a large enough TCP window for full LiDAR frames
+    server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, LIDAR_BUFFER_SIZE)
+    
+    selector = selectors.DefaultSelector()
+    
+    def close_client(client_socket: socket.socket, addr: tuple) -> None:
+        selector.unregister(client_socket)
+        client_socket.close()
+        logger.info("[TCP Server] Connection closed: %s", addr)
+    
     try:
         server_sock.bind((TCP_HOST, TCP_PORT))
         server_sock.listen(5)  # Allow up to 5 queued connections
-        print(f"[TCP Server] Listening for LiDAR data...")
+        server_sock.setblocking(False)
+        selector.register(server_sock, selectors.EVENT_READ)
+        logger.info("[TCP Server] Listening for LiDAR data...")
+        
+        # Monotonic time at which a paused listener is re-registered
+        accept_resume_at = None
         
         while True:
-            try:
-                # Accept incoming client connection
-                client_socket, addr = server_sock.accept()
-                
-                # Handle client in a separate thread
-                client_thread = threading.Thread(
-                    target=handle_lidar_client,
-                    args=(client_socket, addr),
-                    daemon=True
-                )
-                client_thread.start()
+            select_timeout = None
+            if accept_resume_at is not None:
+                select_timeout = accept_resume_at - time.monotonic()
+                if select_timeout <= 0:
+                    selector.register(server_sock, selectors.EVENT_READ)
+                    accept_resume_at = None
+                    select_timeout = None
             
-            except Exception as e:
-                print(f"[TCP Server] Error accepting connection: {e}")
-                time.sleep(1)
+            for key, _ in selector.select(select_timeout):
+                # Listening socket: accept incoming client connection
+                if key.data is None:
+                    try:
+                        client_socket, addr = server_sock.accept()
+                    except (BlockingIOError, InterruptedError):
+                        continue
+                    except Exception as e:
+                        # Pause only the listener (e.g. on EMFILE) so connected
+                        # clients keep being served during the backoff
+                        logger.error("[TCP Server] Error accepting connection: %s", e)
+                        selector.unregister(server_sock)
+                        accept_resume_at = time.monotonic() + ACCEPT_ERROR_BACKOFF
+                        continue
+                    
+                    logger.info("[TCP Server] Client connected from %s", addr)
+                    client_socket.setblocking(False)
+                    
+                    # Disable Nagle so ACKs and any replies are not held back
+                    client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    
+                    selector.register(client_socket, selectors.EVENT_READ,
+                                      LidarClientState(addr))
+                    continue
+                
+                # Client socket: advance its framing state machine
+                client_socket = key.fileobj
+                state = key.data
+                try:
+                    keep_open = read_lidar_client(client_socket, state)
+                except Exception as e:
+                    logger.error("[TCP Server] Error handling client %s: %s", state.addr, e)
+                    keep_open = False
+                
+                if not keep_open:
+                    close_client(client_socket, state.addr)
     
     except Exception as e:
-        print(f"[TCP Server] Fatal error: {e}")
+        logger.error("[TCP Server] Fatal error: %s", e)
     finally:
+        for key in list(selector.get_map().values()):
+            if key.data is not None:
+                close_client(key.fileobj, key.data.addr)
+        selector.close()
         server_sock.close()
-        print("[TCP Server] Shutdown")
+        logger.info("[TCP Server] Shutdown")
 
 
 # ============================================
 # Main DORA Node
 # ============================================
 
+def drain_dora_events(node: Node, max_events: int) -> bool:
+    """
+    Drain DORA events that are already queued, without blocking.
+    
+    Handling a backlog of ticks in one tight loop means the sensor wait and
+    publish below run once per batch instead of once per queued event.
+    
+    Args:
+        node: DORA node to read pending events from
+        max_events: Maximum number of events to drain
+    
+    Returns:
+        True if a STOP event was drained, False once the queue is empty or
+        max_events were drained (a closed stream ends the main for-loop)
+    """
+    for _ in range(max_events):
+        event = node.try_recv()
+        if event is None:
+            return False
+        
+        event_type = event["type"]
+        if event_type == "INPUT":
+            logger.debug("[Main] Received DORA input: %s", event["id"])
+        elif event_type == "STOP":
+            return True
+        elif event_type == "ERROR":
+            logger.warning("[Main] DORA error event: %s", event.get("error"))
+    
+    return False
+
+
 def main():
     """
     Main DORA node entry point.
@@ -269,6 +545,8 @@ def main():
     2. Enters the DORA event loop
     3. Publishes sensor data to DORA outputs when available
     """
+    logging.basicConfig(level=LOG_LEVEL, format="%(message)s")
+    
     print("=" * 60)
     print("DORA RECEIVER NODE - CARLA to DORA Bridge")
     print("=" * 60)
@@ -276,22 +554,24 @@ def main():
     # Start UDP server thread for GNSS and IMU
     udp_thread = threading.Thread(target=udp_server_thread, daemon=True)
     udp_thread.start()
-    print("[Main] UDP server thread started")
+    logger.info("[Main] UDP server thread started")
     
     # Start TCP server thread for LiDAR
     tcp_thread = threading.Thread(target=tcp_server_thread, daemon=True)
     tcp_thread.start()
-    print("[Main] TCP server thread started")
+    logger.info("[Main] TCP server thread started")
     
     # Brief pause to allow servers to initialize
     time.sleep(0.5)
     
     # Initialize DORA node
     node = Node()
-    print("[Main] DORA node initialized")
-    print("[Main] Waiting for sensor data from CARLA...")
+    logger.info("[Main] DORA node initialized")
+    logger.info("[Main] Waiting for sensor data from CARLA...")
     print("=" * 60)
     
+    send_output = node.send_output
+    
     # DORA event loop
     try:
         for event in node:
@@ -300,38 +580,32 @@ def main():
             # Handle timer ticks or other input events
             if event_type == "INPUT":
                 event_id = event["id"]
-                print(f"[Main] Received DORA input: {event_id}")
-            
-            # Check for new GNSS data
-            gnss_data = sensor_buffer.get_and_clear_gnss()
-            if gnss_data is not None:
-                # Convert to PyArrow format and send to DORA
-                gnss_json = json.dumps(gnss_data)
-                node.send_output("gnss_data", pa.array([gnss_json]))
-                print(f"[Main] Published GNSS data to DORA: timestamp={gnss_data.get('timestamp', 'N/A')}")
-            
-            # Check for new IMU data
-            imu_data = sensor_buffer.get_and_clear_imu()
-            if imu_data is not None:
-                # Convert to PyArrow format and send to DORA
-                imu_json = json.dumps(imu_data)
-                node.send_output("imu_data", pa.array([imu_json]))
-                print(f"[Main] Published IMU data to DORA: timestamp={imu_data.get('timestamp', 'N/A')}")
+                logger.debug("[Main] Received DORA input: %s", event_id)
+            elif event_type == "STOP":
+                break
+            elif event_type == "ERROR":
+                logger.warning("[Main] DORA error event: %s", event.get("error"))
             
-            # Check for new LiDAR data
-            lidar_data = sensor_buffer.get_and_clear_lidar()
-            if lidar_data is not None:
-                # Send binary data as PyArrow binary array
-                node.send_output("lidar_data", pa.array([lidar_data], type=pa.binary()))
-                print(f"[Main] Published LiDAR data to DORA: {len(lidar_data)} bytes")
+            # Drain the rest of the queued events before publishing
+            if drain_dora_events(node, DORA_EVENT_BATCH_SIZE - 1):
+                break
             
-            # Small sleep to prevent busy-waiting
-            time.sleep(0.01)  # 10ms polling interval
+            # Block on sensor data and publish every arrival until the next
+            # DORA event is queued, instead of only once per tick
+            while node.is_empty():
+                samples = sensor_buffer.wait_any(SENSOR_WAIT_TIMEOUT)
+                
+                # Forward each fresh payload untouched as a PyArrow binary array
+                for (output_id, label), sample in zip(SENSOR_OUTPUTS, samples):
+                    if sample is not None:
+                        send_output(output_id, to_binary_array(sample.raw))
+                        logger.debug("[Main] Published %s data to DORA: %d bytes, timestamp=%s",
+                                     label, len(sample.raw), sample.timestamp)
     
     except KeyboardInterrupt:
-        print("\n[Main] Shutting down receiver node...")
+        logger.info("[Main] Shutting down receiver node...")
     except Exception as e:
-        print(f"[Main] Error in DORA event loop: {e}")
+        logger.error("[Main] Error in DORA event loop: %s", e)
         raise
 
 
@@ -16,9 +16,11 @@ Author: DORA Autonomous Driving Team
 Date: 2025-10-31
 """
 
-import json
+import logging
 import math
 from typing import Dict, List, Tuple, Optional, Any
+import msgspec
+import numpy as np
 import pyarrow as pa
 
 
@@ -30,6 +32,13 @@ import pyarrow as pa
 LOOKAHEAD_DISTANCE = 5.0  # meters - distance to look ahead on the path
 MIN_LOOKAHEAD = 3.0       # meters - minimum lookahead distance
 MAX_LOOKAHEAD = 10.0      # meters - maximum lookahead distance
+LOOKAHEAD_THRESHOLD_RATIO = 0.8  # accept waypoints at 80% of the lookahead distance
+
+# Lookahead point selection: "euclidean" takes the first waypoint at least
+# LOOKAHEAD_THRESHOLD_RATIO * LOOKAHEAD_DISTANCE from the vehicle; "arc_length"
+# takes the first waypoint LOOKAHEAD_DISTANCE along the path past the current
+# target waypoint (a single binary search, no distance checks)
+LOOKAHEAD_METHOD = "euclidean"
 
 # Control Parameters
 CONSTANT_THROTTLE = 0.4   # Fixed throttle value for simple control
@@ -37,9 +46,25 @@ CONSTANT_BRAKE = 0.0      # No braking in this simple version
 
 # Vehicle Parameters (CARLA default)
 WHEELBASE = 2.89          # meters - distance between front and rear axles
+MAX_STEERING_ANGLE = 0.52 # radians - steering angle mapped to steer = ±1.0 (~30°)
+INV_MAX_STEERING_ANGLE = 1.0 / MAX_STEERING_ANGLE
 
 # Path Following Tolerance
 WAYPOINT_REACHED_THRESHOLD = 2.0  # meters - distance to consider waypoint reached
+WAYPOINT_REACHED_THRESHOLD_SQ = WAYPOINT_REACHED_THRESHOLD ** 2  # compared to squared distances
+
+# Slack subtracted from arc-length bounds so rounding never skips a candidate
+ARC_LENGTH_MARGIN = 1e-6  # meters
+
+# GNSS timestamps more than this far behind the newest one mean the simulation
+# restarted (sim time resets on world/scenario reload) rather than a stale fix
+GNSS_TIMESTAMP_RESET_THRESHOLD = 1.0  # seconds
+
+# Logging Configuration
+LOG_LEVEL = logging.INFO  # DEBUG traces every tick
+COMMAND_LOG_INTERVAL = 50  # commands between INFO summaries
+
+logger = logging.getLogger("planner_operator")
 
 
 # ============================================
@@ -57,76 +82,128 @@ DEFAULT_ROUTE: List[Tuple[float, float]] = [
 ]
 
 
+# ============================================
+# Message Serialization
+# ============================================
+
+# Reusable JSON decoder for GNSS messages (C implementation, bytes in)
+json_decoder = msgspec.json.Decoder()
+
+# Control commands are published as a one-row Arrow struct with typed fields,
+# so neither side serializes or parses text
+CONTROL_CMD_TYPE = pa.struct([
+    ("steer", pa.float64()),
+    ("throttle", pa.float64()),
+    ("brake", pa.float64()),
+    ("timestamp", pa.float64()),
+])
+
+
 # ============================================
 # Utility Functions
 # ============================================
 
-def calculate_distance(point1: Tuple[float, float], point2: Tuple[float, float]) -> float:
+def calculate_distance_sq(x1: float, y1: float, x2: float, y2: float) -> float:
     """
-    Calculate Euclidean distance between two 2D points.
+    Calculate squared Euclidean distance between two 2D points.
+    
+    All planner distance checks compare against (squared) thresholds, so
+    none of them need the square root.
     
     Args:
-        point1: First point (x, y)
-        point2: Second point (x, y)
+        x1, y1: First point in meters
+        x2, y2: Second point in meters
     
     Returns:
-        Distance in meters
+        Squared distance in square meters
     """
-    dx = point2[0] - point1[0]
-    dy = point2[1] - point1[1]
-    return math.sqrt(dx * dx + dy * dy)
+    dx = x2 - x1
+    dy = y2 - y1
+    return dx * dx + dy * dy
 
 
-def find_nearest_waypoint(position: Tuple[float, float], 
-                          waypoints: List[Tuple[float, float]],
+def find_nearest_waypoint(position: Tuple[float, float],
+                          waypoints_x: np.ndarray,
+                          waypoints_y: np.ndarray,
                           current_index: int) -> int:
     """
     Find the index of the nearest waypoint ahead of the vehicle.
     
+    The scan over the remaining waypoints runs as one vectorized NumPy
+    expression on the route's coordinate arrays.
+    
     Args:
         position: Current vehicle position (x, y)
-        waypoints: List of waypoints defining the path
+        waypoints_x: Waypoint x coordinates (float64, contiguous)
+        waypoints_y: Waypoint y coordinates (float64, contiguous)
         current_index: Current target waypoint index
     
     Returns:
         Index of the nearest waypoint ahead
     """
-    min_distance = float('inf')
-    nearest_index = current_index
-    
-    # Search forward from current index
-    for i in range(current_index, len(waypoints)):
-        distance = calculate_distance(position, waypoints[i])
-        if distance < min_distance:
-            min_distance = distance
-            nearest_index = i
+    if current_index >= len(waypoints_x):
+        return current_index
     
-    return nearest_index
+    # Search forward from current index (squared distance has the same argmin)
+    dx = waypoints_x[current_index:] - position[0]
+    dy = waypoints_y[current_index:] - position[1]
+    return int(np.argmin(dx * dx + dy * dy)) + current_index
 
 
 def find_lookahead_point(position: Tuple[float, float],
                          waypoints: List[Tuple[float, float]],
+                         arc_lengths: np.ndarray,
                          current_waypoint_index: int,
-                         lookahead_distance: float) -> Tuple[Optional[Tuple[float, float]], int]:
+                         lookahead_distance: float,
+                         current_distance_sq: Optional[float] = None
+                         ) -> Tuple[Optional[Tuple[float, float]], int]:
     """
     Find the lookahead point on the path at the specified lookahead distance.
     
+    Waypoints that cannot be far enough away are skipped with a binary search
+    over the cumulative path length: waypoint i is at most
+    d(current) + arc[i] - arc[current] from the vehicle (triangle inequality),
+    so the scan starts at the first waypoint where that bound reaches the
+    threshold. The result is the same as scanning from the current waypoint.
+    
     Args:
         position: Current vehicle position (x, y)
         waypoints: List of waypoints defining the path
+        arc_lengths: Cumulative path length at each waypoint (arc_lengths[0] == 0)
         current_waypoint_index: Current target waypoint index
         lookahead_distance: Desired lookahead distance in meters
+        current_distance_sq: Squared distance to the current waypoint, if the
+            caller already computed it
     
     Returns:
         Tuple of (lookahead_point, next_waypoint_index) or (None, current_index) if not found
     """
-    # Search from current waypoint to end of path
-    for i in range(current_waypoint_index, len(waypoints)):
+    px, py = position
+    threshold = lookahead_distance * LOOKAHEAD_THRESHOLD_RATIO
+    threshold_sq = threshold * threshold
+    start_index = current_waypoint_index
+    
+    if start_index < len(waypoints):
+        distance_sq = current_distance_sq
+        if distance_sq is None:
+            wx, wy = waypoints[start_index]
+            distance_sq = calculate_distance_sq(px, py, wx, wy)
+        if distance_sq >= threshold_sq:
+            return waypoints[start_index], start_index
+        
+        # The arc-length bound needs the true distance (one sqrt per search)
+        distance = math.sqrt(distance_sq)
+        min_arc = arc_lengths[start_index] + threshold - distance - ARC_LENGTH_MARGIN
+        start_index = max(start_index,
+                          int(np.searchsorted(arc_lengths, min_arc, side="left")))
+    
+    # Search from the first possible candidate to end of path
+    for i in range(start_index, len(waypoints)):
         waypoint = waypoints[i]
-        distance = calculate_distance(position, waypoint)
+        distance_sq = calculate_distance_sq(px, py, waypoint[0], waypoint[1])
         
         # If this waypoint is close to the lookahead distance, use it
-        if distance >= lookahead_distance * 0.8:  # 80% threshold for flexibility
+        if distance_sq >= threshold_sq:
             return waypoint, i
     
     # If no suitable point found, use the last waypoint
@@ -136,9 +213,39 @@ def find_lookahead_point(position: Tuple[float, float],
     return None, current_waypoint_index
 
 
-def calculate_pure_pursuit_steering(vehicle_position: Tuple[float, float],
+def find_lookahead_point_by_arc_length(waypoints: List[Tuple[float, float]],
+                                       arc_lengths: np.ndarray,
+                                       current_waypoint_index: int,
+                                       lookahead_distance: float
+                                       ) -> Tuple[Optional[Tuple[float, float]], int]:
+    """
+    Find the lookahead point by path length instead of straight-line distance.
+    
+    Returns the first waypoint whose cumulative path length is at least
+    lookahead_distance beyond the current waypoint's, found with one binary
+    search. Valid because the path is only ever traversed forward.
+    
+    Args:
+        waypoints: List of waypoints defining the path
+        arc_lengths: Cumulative path length at each waypoint (arc_lengths[0] == 0)
+        current_waypoint_index: Current target waypoint index
+        lookahead_distance: Desired lookahead distance along the path in meters
+    
+    Returns:
+        Tuple of (lookahead_point, next_waypoint_index) or (None, current_index) if not found
+    """
+    if not waypoints:
+        return None, current_waypoint_index
+    
+    last_index = len(waypoints) - 1
+    target_arc = arc_lengths[min(current_waypoint_index, last_index)] + lookahead_distance
+    index = min(int(np.searchsorted(arc_lengths, target_arc, side="left")), last_index)
+    return waypoints[index], index
+
+
+def calculate_pure_pursuit_steering(px: float, py: float,
+                                    tx: float, ty: float,
                                     vehicle_heading: float,
-                                    target_point: Tuple[float, float],
                                     wheelbase: float) -> float:
     """
     Calculate steering angle using Pure Pursuit algorithm.
@@ -146,18 +253,20 @@ def calculate_pure_pursuit_steering(vehicle_position: Tuple[float, float],
     The Pure Pursuit algorithm computes the curvature needed to reach
     a target point (lookahead point) from the vehicle's current position.
     
+    All arguments are plain floats (no tuples to unpack per call).
+    
     Args:
-        vehicle_position: Current vehicle position (x, y) in meters
+        px, py: Current vehicle position in meters
+        tx, ty: Target lookahead point in meters
         vehicle_heading: Current vehicle heading in radians (0 = East, π/2 = North)
-        target_point: Target lookahead point (x, y) in meters
         wheelbase: Vehicle wheelbase in meters
     
     Returns:
         Steering angle in range [-1.0, 1.0] (CARLA convention)
     """
     # Calculate vector from vehicle to target
-    dx = target_point[0] - vehicle_position[0]
-    dy = target_point[1] - vehicle_position[1]
+    dx = tx - px
+    dy = ty - py
     
     # Calculate angle to target point in global frame
     target_angle = math.atan2(dy, dx)
@@ -169,7 +278,7 @@ def calculate_pure_pursuit_steering(vehicle_position: Tuple[float, float],
     alpha = math.atan2(math.sin(alpha), math.cos(alpha))
     
     # Calculate distance to target (lookahead distance)
-    ld = math.sqrt(dx * dx + dy * dy)
+    ld = math.hypot(dx, dy)
     
     # Avoid division by zero
     if ld < 0.1:
@@ -180,12 +289,11 @@ def calculate_pure_pursuit_steering(vehicle_position: Tuple[float, float],
     steering_angle = math.atan(2.0 * wheelbase * math.sin(alpha) / ld)
     
     # Convert to CARLA steering range [-1.0, 1.0]
-    # Assuming max steering angle of ~30 degrees (0.52 radians)
-    max_steering_rad = 0.52
-    normalized_steering = steering_angle / max_steering_rad
+    normalized_steering = steering_angle * INV_MAX_STEERING_ANGLE
     
-    # Clamp to valid range
-    normalized_steering = max(-1.0, min(1.0, normalized_steering))
+    # Clamp to valid range (one range test; saturate to ±1.0 by sign)
+    if not (-1.0 <= normalized_steering <= 1.0):
+        normalized_steering = math.copysign(1.0, normalized_steering)
     
     return normalized_steering
 
@@ -208,27 +316,72 @@ class Operator:
         
         Sets up the route waypoints and initializes state tracking variables.
         """
+        # Configure only this module's logger: operators share the dora
+        # runtime process, so the root logger is not ours to set up
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("[Planner] %(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(LOG_LEVEL)
+            logger.propagate = False
+        
         print("=" * 60)
         print("PLANNER OPERATOR - Pure Pursuit Path Tracking")
         print("=" * 60)
         
+        if LOOKAHEAD_METHOD not in ("euclidean", "arc_length"):
+            raise ValueError(f"Unsupported lookahead method {LOOKAHEAD_METHOD!r}, "
+                             f"expected 'euclidean' or 'arc_length'")
+        self._lookahead_by_arc_length: bool = LOOKAHEAD_METHOD == "arc_length"
+        
         # Load predefined route
         self.waypoints: List[Tuple[float, float]] = DEFAULT_ROUTE.copy()
-        print(f"[Planner] Loaded route with {len(self.waypoints)} waypoints")
+        
+        # Route coordinates as separate contiguous arrays for vectorized search
+        route = np.asarray(self.waypoints, dtype=np.float64).reshape(-1, 2)
+        self._wx: np.ndarray = np.ascontiguousarray(route[:, 0])
+        self._wy: np.ndarray = np.ascontiguousarray(route[:, 1])
+        
+        # Cumulative path length at each waypoint, for bounding lookahead scans
+        segment_lengths = np.hypot(np.diff(self._wx), np.diff(self._wy))
+        self._arc: np.ndarray = np.concatenate(([0.0], np.cumsum(segment_lengths)))
+        
+        # Heading of each route segment i -> i+1 (waypoints are static)
+        self._segment_heading: List[float] = [
+            math.atan2(y2 - y1, x2 - x1)
+            for (x1, y1), (x2, y2) in zip(self.waypoints, self.waypoints[1:])
+        ]
+        logger.info("Loaded route with %d waypoints", len(self.waypoints))
         
         # State variables
         self.current_waypoint_index: int = 0
         self.vehicle_position: Optional[Tuple[float, float]] = None
         self.vehicle_heading: float = 0.0  # radians
         
+        # Timestamp of the last GNSS message processed (None until one carries it)
+        self._last_gnss_timestamp: Optional[float] = None
+        
+        # Last computed fix (x, y, raw heading) and its (steering, lookahead_point)
+        self._last_fix: Optional[Tuple[float, float, Any]] = None
+        self._last_result: Optional[Tuple[float, Tuple[float, float]]] = None
+        
         # Statistics
         self.total_commands_sent: int = 0
         self.path_completed: bool = False
         
-        print(f"[Planner] Lookahead distance: {LOOKAHEAD_DISTANCE}m")
-        print(f"[Planner] Constant throttle: {CONSTANT_THROTTLE}")
-        print(f"[Planner] Wheelbase: {WHEELBASE}m")
-        print("[Planner] Initialization complete")
+        # The stop command never changes, so serialize it once
+        stop_command = {
+            "steer": 0.0,
+            "throttle": 0.0,
+            "brake": 1.0,
+            "timestamp": 0.0
+        }
+        self._stop_array: pa.StructArray = pa.array([stop_command], type=CONTROL_CMD_TYPE)
+        
+        logger.info("Lookahead distance: %sm (%s)", LOOKAHEAD_DISTANCE, LOOKAHEAD_METHOD)
+        logger.info("Constant throttle: %s", CONSTANT_THROTTLE)
+        logger.info("Wheelbase: %sm", WHEELBASE)
+        logger.info("Initialization complete")
         print("=" * 60)
     
     def on_event(
@@ -274,8 +427,24 @@ class Operator:
         try:
             # Extract GNSS data from PyArrow array
             value = dora_event["value"]
-            gnss_json_str = value[0].as_py()  # Get first element as Python object
-            gnss_message = json.loads(gnss_json_str)
+            # Decode the raw JSON forwarded by receiver_node straight from the
+            # Arrow buffer (no intermediate bytes copy)
+            gnss_message = json_decoder.decode(value[0].as_buffer())
+            
+            # Drop duplicate or slightly out-of-order fixes: only a newer position
+            # can change the command, and a backlog is worked off without replanning
+            timestamp = gnss_message.get("timestamp")
+            if timestamp is not None:
+                last_timestamp = self._last_gnss_timestamp
+                if last_timestamp is not None and timestamp <= last_timestamp:
+                    if last_timestamp - timestamp <= GNSS_TIMESTAMP_RESET_THRESHOLD:
+                        logger.debug("Skipping stale GNSS message: timestamp=%s", timestamp)
+                        return
+                    logger.warning("GNSS timestamp jumped back from %s to %s; "
+                                   "assuming simulation restart", last_timestamp, timestamp)
+                self._last_gnss_timestamp = timestamp
+            else:
+                timestamp = 0.0
             
             # Extract position data
             gnss_data = gnss_message.get("data", {})
@@ -292,82 +461,149 @@ class Operator:
             if "heading" in gnss_data:
                 self.vehicle_heading = math.radians(gnss_data["heading"])
             
-            print(f"[Planner] Vehicle position: ({longitude:.2f}, {latitude:.2f}), "
-                  f"altitude: {altitude:.2f}m")
+            logger.debug("Vehicle position: (%.2f, %.2f), altitude: %.2fm",
+                         longitude, latitude, altitude)
             
             # Check if path is completed
             if self.path_completed:
-                print("[Planner] Path completed - sending stop command")
-                self._send_stop_command(send_output)
-                return
-            
-            # Update current waypoint if close to target
-            if self.current_waypoint_index < len(self.waypoints):
-                current_waypoint = self.waypoints[self.current_waypoint_index]
-                distance_to_waypoint = calculate_distance(self.vehicle_position, current_waypoint)
-                
-                if distance_to_waypoint < WAYPOINT_REACHED_THRESHOLD:
-                    print(f"[Planner] Reached waypoint {self.current_waypoint_index}: {current_waypoint}")
-                    self.current_waypoint_index += 1
-                    
-                    # Check if all waypoints reached
-                    if self.current_waypoint_index >= len(self.waypoints):
-                        print("[Planner] All waypoints reached! Path complete.")
-                        self.path_completed = True
-                        self._send_stop_command(send_output)
-                        return
-            
-            # Find lookahead point using Pure Pursuit
-            lookahead_point, next_index = find_lookahead_point(
-                self.vehicle_position,
-                self.waypoints,
-                self.current_waypoint_index,
-                LOOKAHEAD_DISTANCE
-            )
-            
-            if lookahead_point is None:
-                print("[Planner] Warning: No lookahead point found")
+                logger.debug("Path completed - sending stop command")
                 self._send_stop_command(send_output)
                 return
             
-            # Estimate vehicle heading from movement direction if not available
-            if self.current_waypoint_index > 0 and self.current_waypoint_index < len(self.waypoints):
-                prev_wp = self.waypoints[self.current_waypoint_index - 1]
-                curr_wp = self.waypoints[self.current_waypoint_index]
-                dx = curr_wp[0] - prev_wp[0]
-                dy = curr_wp[1] - prev_wp[1]
-                self.vehicle_heading = math.atan2(dy, dx)
+            # A repeated fix (same position and heading) yields the same
+            # steering, so reuse the last result instead of recomputing it
+            fix = (longitude, latitude, gnss_data.get("heading"))
+            if fix == self._last_fix:
+                steering, lookahead_point = self._last_result
+            else:
+                result = self._compute_steering(longitude, latitude, send_output)
+                if result is None:
+                    return
+                steering, lookahead_point = result
+                self._last_fix = fix
+                self._last_result = result
             
-            # Calculate steering using Pure Pursuit
-            steering = calculate_pure_pursuit_steering(
-                self.vehicle_position,
-                self.vehicle_heading,
-                lookahead_point,
-                WHEELBASE
+            # Create control command as a row in CONTROL_CMD_TYPE field order
+            # (a tuple row skips building a dict and matching it by key)
+            control_command = (
+                float(steering),
+                float(CONSTANT_THROTTLE),
+                float(CONSTANT_BRAKE),
+                timestamp,
             )
             
-            # Create control command
-            control_command = {
-                "steer": float(steering),
-                "throttle": float(CONSTANT_THROTTLE),
-                "brake": float(CONSTANT_BRAKE),
-                "timestamp": gnss_message.get("timestamp", 0.0)
-            }
-            
-            # Send control command to DORA
-            control_json = json.dumps(control_command)
-            send_output("control_cmd", pa.array([control_json]))
+            # Send control command to DORA as a typed struct array
+            send_output("control_cmd", pa.array([control_command], type=CONTROL_CMD_TYPE))
             
             self.total_commands_sent += 1
             
-            print(f"[Planner] Control command #{self.total_commands_sent}: "
-                  f"steer={steering:.3f}, throttle={CONSTANT_THROTTLE:.2f}, "
-                  f"target=({lookahead_point[0]:.2f}, {lookahead_point[1]:.2f})")
+            # Rate-limited summary at INFO, every command at DEBUG
+            if self.total_commands_sent % COMMAND_LOG_INTERVAL == 0:
+                log_level = logging.INFO
+            else:
+                log_level = logging.DEBUG
+            logger.log(log_level, "Control command #%d: steer=%.3f, throttle=%.2f, "
+                       "target=(%.2f, %.2f)", self.total_commands_sent, steering,
+                       CONSTANT_THROTTLE, lookahead_point[0], lookahead_point[1])
+        
+        except Exception:
+            logger.exception("Error processing GNSS data")
+    
+    def _compute_steering(self, px: float, py: float, send_output: Any
+                          ) -> Optional[Tuple[float, Tuple[float, float]]]:
+        """
+        Run Pure Pursuit for a new vehicle position.
+        
+        Sends a stop command itself when the path is completed or no
+        lookahead point exists.
+        
+        Args:
+            px: Vehicle x position in meters
+            py: Vehicle y position in meters
+            send_output: Callable to send control commands
+        
+        Returns:
+            Tuple of (steering, lookahead_point), or None if a stop command was sent
+        """
+        # Advance past a reached waypoint and find the lookahead point
+        lookahead_point, next_index = self._advance_and_lookahead(px, py)
+        
+        if self.path_completed:
+            self._send_stop_command(send_output)
+            return None
+        
+        if lookahead_point is None:
+            logger.warning("No lookahead point found")
+            self._send_stop_command(send_output)
+            return None
+        
+        # Estimate vehicle heading from movement direction if not available
+        if self.current_waypoint_index > 0 and self.current_waypoint_index < len(self.waypoints):
+            self.vehicle_heading = self._segment_heading[self.current_waypoint_index - 1]
+        
+        # Calculate steering using Pure Pursuit
+        steering = calculate_pure_pursuit_steering(
+            px, py,
+            lookahead_point[0], lookahead_point[1],
+            self.vehicle_heading,
+            WHEELBASE
+        )
+        return steering, lookahead_point
+    
+    def _advance_and_lookahead(self, px: float, py: float
+                               ) -> Tuple[Optional[Tuple[float, float]], int]:
+        """
+        Update the target waypoint and find the lookahead point in one pass.
+        
+        The squared distance to the current waypoint is computed once and used
+        both for the "reached" check and as the start of the lookahead search.
+        Sets path_completed when the last waypoint is reached.
+        
+        Args:
+            px: Vehicle x position in meters
+            py: Vehicle y position in meters
+        
+        Returns:
+            Tuple of (lookahead_point, next_waypoint_index), as find_lookahead_point;
+            lookahead_point is None once the path is completed
+        """
+        index = self.current_waypoint_index
+        distance_sq = None
+        
+        if index < len(self.waypoints):
+            current_waypoint = self.waypoints[index]
+            distance_sq = calculate_distance_sq(px, py, current_waypoint[0], current_waypoint[1])
+            
+            # Update current waypoint if close to target
+            if distance_sq < WAYPOINT_REACHED_THRESHOLD_SQ:
+                logger.info("Reached waypoint %d: %s", index, current_waypoint)
+                index += 1
+                self.current_waypoint_index = index
+                distance_sq = None
+                
+                # Check if all waypoints reached
+                if index >= len(self.waypoints):
+                    logger.info("All waypoints reached! Path complete.")
+                    self.path_completed = True
+                    return None, index
+        
+        # Find lookahead point using Pure Pursuit
+        if self._lookahead_by_arc_length:
+            return find_lookahead_point_by_arc_length(
+                self.waypoints,
+                self._arc,
+                index,
+                LOOKAHEAD_DISTANCE
+            )
         
-        except Exception as e:
-            print(f"[Planner] Error processing GNSS data: {e}")
-            import traceback
-            traceback.print_exc()
+        return find_lookahead_point(
+            (px, py),
+            self.waypoints,
+            self._arc,
+            index,
+            LOOKAHEAD_DISTANCE,
+            distance_sq
+        )
     
     def _send_stop_command(self, send_output: Any) -> None:
         """
@@ -376,13 +612,5 @@ class Operator:
         Args:
             send_output: Callable to send control commands
         """
-        stop_command = {
-            "steer": 0.0,
-            "throttle": 0.0,
-            "brake": 1.0,
-            "timestamp": 0.0
-        }
-        
-        stop_json = json.dumps(stop_command)
-        send_output("control_cmd", pa.array([stop_json]))
-        print("[Planner] Stop command sent")
+        send_output("control_cmd", self._stop_array)
+        logger.debug("Stop command sent")